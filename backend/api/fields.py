@@ -1,13 +1,103 @@
-import base64
-
 from django.core.files.base import ContentFile
-from rest_framework.serializers import ImageField
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from rest_framework.serializers import ImageField, PrimaryKeyRelatedField
+
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+DECODE_CHUNK_SIZE = 4 * 1024 * 1024
+STREAM_DECODE_MIN_SIZE = 1024 * 1024
+BASE64_WHITESPACE = b' \t\n\r'
 
 
 class Base64ImageField(ImageField):
     def to_internal_value(self, data):
-        if isinstance(data, str) and data.startswith('data:image'):
-            format, imgstr = data.split(';base64,')
-            ext = format.split('/')[-1]
-            data = ContentFile(base64.b64decode(imgstr), name='image.' + ext)
+        if not isinstance(data, str) or not data.startswith('data:image'):
+            return super().to_internal_value(data)
+        format, _, imgstr = data.partition(';base64,')
+        ext = format.rpartition('/')[2]
+        return super().to_internal_value(self.decode(imgstr, 'image.' + ext))
+
+    def decode(self, imgstr, name):
+        cache = self.get_decode_cache()
+        key = (name, imgstr)
+        if key not in cache:
+            if len(imgstr) < STREAM_DECODE_MIN_SIZE:
+                cache[key] = self.decode_in_memory(imgstr, name)
+            else:
+                cache[key] = self.decode_stream(imgstr, name)
+        file = cache[key]
+        file.seek(0)
+        return file
+
+    def decode_in_memory(self, imgstr, name):
+        try:
+            return ContentFile(
+                base64.b64decode(
+                    imgstr.encode('ascii').translate(None, BASE64_WHITESPACE),
+                    validate=True,
+                ),
+                name=name,
+            )
+        except ValueError:
+            self.fail('invalid_image')
+
+    def decode_stream(self, imgstr, name):
+        file = TemporaryUploadedFile(name, None, 0, None)
+        tail = b''
+        try:
+            for start in range(0, len(imgstr), DECODE_CHUNK_SIZE):
+                chunk = tail + imgstr[
+                    start:start + DECODE_CHUNK_SIZE
+                ].encode('ascii').translate(None, BASE64_WHITESPACE)
+                end = max(len(chunk) - len(chunk) % 4 - 4, 0)
+                if b'=' in chunk[:end]:
+                    raise ValueError('Excess data after padding.')
+                file.write(base64.b64decode(chunk[:end], validate=True))
+                tail = chunk[end:]
+            file.write(base64.b64decode(tail, validate=True))
+        except ValueError:
+            file.close()
+            self.fail('invalid_image')
+        file.size = file.tell()
+        return file
+
+    def get_decode_cache(self):
+        request = self.context.get('request')
+        if request is None:
+            return {}
+        if not hasattr(request, '_b64_cache'):
+            request._b64_cache = {}
+        return request._b64_cache
+
+    @staticmethod
+    def close_decoded_files(request):
+        for file in getattr(request, '_b64_cache', {}).values():
+            file.close()
+
+
+class CachedPrimaryKeyRelatedField(PrimaryKeyRelatedField):
+    @staticmethod
+    def get_pk(value):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.isdecimal():
+            return int(value)
+        return None
+
+    def fill_cache(self, values):
+        queryset = self.get_queryset()
+        pks = {self.get_pk(value) for value in values} - {None}
+        self.context.setdefault('pk_cache', {})[queryset.model] = (
+            queryset.in_bulk(pks)
+        )
+
+    def to_internal_value(self, data):
+        queryset = self.get_queryset()
+        cache = self.context.get('pk_cache', {}).get(queryset.model, {})
+        pk = self.get_pk(data)
+        if pk in cache:
+            return cache[pk]
         return super().to_internal_value(data)
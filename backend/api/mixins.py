@@ -0,0 +1,52 @@
+import hashlib
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from .fields import Base64ImageField
+
+
+def get_cache_version_key(model):
+    return f'api:{model._meta.label_lower}:version'
+
+
+def get_cache_version(model):
+    return cache.get_or_set(get_cache_version_key(model), uuid4().hex, None)
+
+
+class CachedReadMixin:
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve,
+            request,
+            *args,
+            **kwargs,
+        )
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        model = self.get_queryset().model
+        path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        key = (
+            f'api:{model._meta.label_lower}:'
+            f'{get_cache_version(model)}:{path_hash}'
+        )
+        data = cache.get(key)
+        if data is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            cache.set(key, data, settings.API_CACHE_TIMEOUT)
+        return Response(data)
+
+
+class CloseDecodedFilesMixin:
+    def finalize_response(self, request, response, *args, **kwargs):
+        Base64ImageField.close_decoded_files(request)
+        return super().finalize_response(request, response, *args, **kwargs)
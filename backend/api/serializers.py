@@ -1,8 +1,7 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.shortcuts import get_object_or_404
+from django.db import transaction
 from rest_framework import serializers
-from rest_framework.validators import UniqueValidator
 
 from recipes.models import (
     AmountOfIngredientInRecipe,
@@ -14,7 +13,8 @@ from recipes.models import (
     Tag,
     TagInRecipe,
 )
-from .fields import Base64ImageField
+from .fields import Base64ImageField, CachedPrimaryKeyRelatedField
+from .validators import CachedUniqueValidator
 
 User = get_user_model()
 
@@ -23,6 +23,8 @@ class UserSerializer(serializers.ModelSerializer):
     is_subscribed = serializers.SerializerMethodField()
 
     def get_is_subscribed(self, obj):
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
         user = self.context.get('request').user
         if user.is_authenticated:
             return Subscription.objects.filter(
@@ -80,7 +82,7 @@ class CreateUserSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(
         required=True,
         help_text='Введите адрес электронной почты',
-        validators=[UniqueValidator(queryset=User.objects.all())],
+        validators=[CachedUniqueValidator(queryset=User.objects.all())],
     )
 
     class Meta:
@@ -111,7 +113,7 @@ class TagSerializer(serializers.ModelSerializer):
 
 
 class TagsInRecipeSerializer(serializers.ModelSerializer):
-    id = serializers.PrimaryKeyRelatedField(
+    id = CachedPrimaryKeyRelatedField(
         queryset=Tag.objects.all(),
         many=False,
     )
@@ -123,7 +125,7 @@ class TagsInRecipeSerializer(serializers.ModelSerializer):
 
 
 class AmountOfIngredientInRecipeSerializer(serializers.ModelSerializer):
-    id = serializers.PrimaryKeyRelatedField(
+    id = CachedPrimaryKeyRelatedField(
         queryset=Ingredient.objects.all(),
         many=False,
     )
@@ -133,19 +135,6 @@ class AmountOfIngredientInRecipeSerializer(serializers.ModelSerializer):
         fields = ('id', 'amount')
 
 
-class IngredientInRecipeSerializer(serializers.ModelSerializer):
-    id = serializers.ReadOnlyField(source='ingredient.id')
-    name = serializers.ReadOnlyField(source='ingredient.name')
-    measurement_unit = serializers.ReadOnlyField(
-        source='ingredient.measurement_unit',
-    )
-
-    class Meta:
-        model = AmountOfIngredientInRecipe
-        fields = ('id', 'name', 'measurement_unit', 'amount')
-        read_only_fields = ('amount',)
-
-
 class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
     author = UserReadSerializer(read_only=True)
     image = Base64ImageField(required=True, allow_null=False)
@@ -160,13 +149,11 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 settings.ERROR_MESSAGES.get('empty_ingredients'),
             )
-        validated_value = []
-        for val in value:
-            if val in validated_value:
-                raise serializers.ValidationError(
-                    settings.ERROR_MESSAGES.get('repeat_ingredients'),
-                )
-            validated_value.append(val)
+        ingredient_ids = [ingredient['id'].pk for ingredient in value]
+        if len(set(ingredient_ids)) != len(ingredient_ids):
+            raise serializers.ValidationError(
+                settings.ERROR_MESSAGES.get('repeat_ingredients'),
+            )
         return value
 
     def validate_tags(self, value):
@@ -174,13 +161,11 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 settings.ERROR_MESSAGES.get('empty_tags'),
             )
-        validated_value = []
-        for val in value:
-            if val in validated_value:
-                raise serializers.ValidationError(
-                    settings.ERROR_MESSAGES.get('repeat_tags'),
-                )
-            validated_value.append(val)
+        tag_ids = [tag['id'].pk for tag in value]
+        if len(set(tag_ids)) != len(tag_ids):
+            raise serializers.ValidationError(
+                settings.ERROR_MESSAGES.get('repeat_tags'),
+            )
         return value
 
     def validate(self, data):
@@ -192,7 +177,17 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
 
     def to_internal_value(self, data):
         tags = data.get('tags', [])
+        ingredients = data.get('ingredients', [])
         data['tags'] = [{'id': tag} for tag in tags]
+        self.fields['tags'].child.fields['id'].fill_cache(tags)
+        if isinstance(ingredients, list):
+            self.fields['ingredients'].child.fields['id'].fill_cache(
+                [
+                    ingredient.get('id')
+                    for ingredient in ingredients
+                    if isinstance(ingredient, dict)
+                ],
+            )
         return super().to_internal_value(data)
 
     def tags_ingredients_bulk_create(self, tags, ingredients, recipe):
@@ -211,6 +206,7 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
         ]
         AmountOfIngredientInRecipe.objects.bulk_create(ingredients_list)
 
+    @transaction.atomic
     def create(self, validated_data):
         ingredients = validated_data.pop('ingredients')
         tags = validated_data.pop('tags')
@@ -220,23 +216,29 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
         self.tags_ingredients_bulk_create(tags, ingredients, recipe)
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         ingredients = validated_data.pop('ingredients')
         tags = validated_data.pop('tags')
         instance = super().update(instance, validated_data)
         instance.tags.clear()
         instance.ingredients.clear()
-
-        recipe = get_object_or_404(Recipe, pk=instance.pk)
-        self.tags_ingredients_bulk_create(tags, ingredients, recipe)
-        return recipe
+        self.tags_ingredients_bulk_create(tags, ingredients, instance)
+        return instance
 
     def to_representation(self, instance):
         recipe_data = super().to_representation(instance)
-        recipe_data['ingredients'] = IngredientInRecipeSerializer(
-            instance.amount_of_ingredient.all(),
-            many=True,
-        ).data
+        recipe_data['ingredients'] = [
+            {
+                'id': amount_of_ingredient.ingredient_id,
+                'name': amount_of_ingredient.ingredient.name,
+                'measurement_unit': (
+                    amount_of_ingredient.ingredient.measurement_unit
+                ),
+                'amount': amount_of_ingredient.amount,
+            }
+            for amount_of_ingredient in instance.amount_of_ingredient.all()
+        ]
         return recipe_data
 
     class Meta:
@@ -254,26 +256,8 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
 
 
 class RecipeRetrieveSerializer(RecipeCreateUpdateSerializer):
-    is_favorited = serializers.SerializerMethodField()
-    is_in_shopping_cart = serializers.SerializerMethodField()
-
-    def get_is_favorited(self, obj):
-        customer = self.context.get('request').user
-        if customer.is_authenticated:
-            return Favorite.objects.filter(
-                customer=customer,
-                recipe=obj,
-            ).exists()
-        return False
-
-    def get_is_in_shopping_cart(self, obj):
-        customer = self.context.get('request').user
-        if customer.is_authenticated:
-            return ShoppingCart.objects.filter(
-                customer=customer,
-                recipe=obj,
-            ).exists()
-        return False
+    is_favorited = serializers.BooleanField(read_only=True)
+    is_in_shopping_cart = serializers.BooleanField(read_only=True)
 
     class Meta(RecipeCreateUpdateSerializer.Meta):
         fields = (
@@ -326,7 +310,9 @@ class BaseSubscriptionSerializer(serializers.ModelSerializer):
 
     def get_recipes(self, obj):
         author = self.get_author(obj)
-        queryset = Recipe.objects.filter(author=author.id)
+        queryset = Recipe.objects.filter(author=author.id).only(
+            *RecipeMiniFieldSerializer.Meta.fields,
+        )
         recipes_limit = self.context['request'].query_params.get(
             'recipes_limit',
         )
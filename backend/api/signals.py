@@ -0,0 +1,15 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from recipes.models import Ingredient, Tag
+from .mixins import get_cache_version_key
+
+
+@receiver([post_save, post_delete], sender=Ingredient)
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_api_cache(sender, **kwargs):
+    transaction.on_commit(
+        lambda: cache.delete(get_cache_version_key(sender)),
+    )
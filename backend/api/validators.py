@@ -0,0 +1,27 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import ValidationError
+from rest_framework.validators import UniqueValidator
+
+
+class CachedUniqueValidator(UniqueValidator):
+    def __call__(self, value, serializer_field):
+        if serializer_field.parent.instance is not None:
+            return super().__call__(value, serializer_field)
+        key = self.get_cache_key(value, serializer_field)
+        if cache.get(key):
+            raise ValidationError(self.message, code='unique')
+        try:
+            super().__call__(value, serializer_field)
+        except ValidationError:
+            cache.set(key, True, settings.UNIQUE_CACHE_TIMEOUT)
+            raise
+
+    def get_cache_key(self, value, serializer_field):
+        value_hash = hashlib.md5(str(value).encode()).hexdigest()
+        return (
+            f'unique:{self.queryset.model._meta.label_lower}:'
+            f'{serializer_field.source_attrs[-1]}:{value_hash}'
+        )
@@ -1,7 +1,15 @@
 import csv
 
 from django.contrib.auth import get_user_model
-from django.db.models import F, Sum
+from django.db.models import (
+    BooleanField,
+    Exists,
+    F,
+    OuterRef,
+    Prefetch,
+    Sum,
+    Value,
+)
 from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
@@ -23,6 +31,7 @@ from recipes.models import (
     Tag,
 )
 from .filter import IngredientNameFilter, RecipeFilterBackend
+from .mixins import CachedReadMixin, CloseDecodedFilesMixin
 from .permissions import IsAuthorOrReadOnlyPermission
 from .serializers import (
     FavoriteSerializer,
@@ -39,9 +48,13 @@ from .serializers import (
 User = get_user_model()
 
 
-class UserMeAvatarAPIView(APIView):
+class UserMeAvatarAPIView(CloseDecodedFilesMixin, APIView):
     def put(self, request):
-        serializer = UserAvatarSerializer(request.user, data=request.data)
+        serializer = UserAvatarSerializer(
+            request.user,
+            data=request.data,
+            context={'request': request},
+        )
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -55,7 +68,7 @@ class UserMeAvatarAPIView(APIView):
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
 
-class IngredientViewSet(viewsets.ModelViewSet):
+class IngredientViewSet(CachedReadMixin, viewsets.ModelViewSet):
     http_method_names = ('get',)
     serializer_class = IngredientSerializer
     queryset = Ingredient.objects.all()
@@ -65,14 +78,14 @@ class IngredientViewSet(viewsets.ModelViewSet):
     pagination_class = None
 
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(CachedReadMixin, viewsets.ModelViewSet):
     http_method_names = ('get',)
     serializer_class = TagSerializer
     queryset = Tag.objects.all()
     pagination_class = None
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(CloseDecodedFilesMixin, viewsets.ModelViewSet):
     http_method_names = ('get', 'post', 'patch', 'delete')
     queryset = Recipe.objects.all()
     filter_backends = (
@@ -85,6 +98,53 @@ class RecipeViewSet(viewsets.ModelViewSet):
     ordering_fields = ('id',)
     ordering = ('-id',)
 
+    def get_queryset(self):
+        queryset = (
+            super()
+            .get_queryset()
+            .prefetch_related(
+                'tags',
+                Prefetch(
+                    'amount_of_ingredient',
+                    queryset=AmountOfIngredientInRecipe.objects.select_related(
+                        'ingredient',
+                    ),
+                ),
+            )
+        )
+        customer = self.request.user
+        if not customer.is_authenticated:
+            return queryset.select_related('author').annotate(
+                is_favorited=Value(False, output_field=BooleanField()),
+                is_in_shopping_cart=Value(False, output_field=BooleanField()),
+            )
+        return queryset.prefetch_related(
+            Prefetch(
+                'author',
+                queryset=User.objects.annotate(
+                    is_subscribed=Exists(
+                        Subscription.objects.filter(
+                            subscriber=customer,
+                            author=OuterRef('pk'),
+                        ),
+                    ),
+                ),
+            ),
+        ).annotate(
+            is_favorited=Exists(
+                Favorite.objects.filter(
+                    customer=customer,
+                    recipe=OuterRef('pk'),
+                ),
+            ),
+            is_in_shopping_cart=Exists(
+                ShoppingCart.objects.filter(
+                    customer=customer,
+                    recipe=OuterRef('pk'),
+                ),
+            ),
+        )
+
     def get_serializer_class(self):
         if self.action == 'shopping_cart':
             return ShoppingCartSerializer
@@ -211,6 +271,20 @@ class ShortLinkView(APIView):
 class UserViewSet(UserViewSet):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        subscriber = self.request.user
+        if subscriber.is_authenticated:
+            queryset = queryset.annotate(
+                is_subscribed=Exists(
+                    Subscription.objects.filter(
+                        subscriber=subscriber,
+                        author=OuterRef('pk'),
+                    ),
+                ),
+            )
+        return queryset
+
     def get_permissions(self):
         if self.action == 'me':
             return [permissions.IsAuthenticated()]
@@ -128,6 +128,9 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 6,
 }
 
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 60 * 15))
+UNIQUE_CACHE_TIMEOUT = int(os.getenv('UNIQUE_CACHE_TIMEOUT', 60))
+
 DJOSER = {
     'LOGIN_FIELD': 'email',
     'HIDE_USERS': False,